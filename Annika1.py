@@ -1,63 +1,25 @@
 # streamlit_app.py
-import yfinance as yf
 import pandas as pd
+import numpy as np
 import streamlit as st
-
-# Define portfolio
-portfolio = [
-    {"Ticker": "URTH", "Quantity": 480},
-    {"Ticker": "WFC", "Quantity": 400},
-    {"Ticker": "HLBZF", "Quantity": 185},
-    {"Ticker": "C", "Quantity": 340},
-    {"Ticker": "BPAQF", "Quantity": 2000},
-    {"Ticker": "POAHF", "Quantity": 150},
-    {"Ticker": "EXV1.DE", "Quantity": 284},
-    {"Ticker": "1COV.DE", "Quantity": 100},
-    {"Ticker": "SPY", "Quantity": 10},
-    {"Ticker": "HYMTF", "Quantity": 100},
-    {"Ticker": "SHEL", "Quantity": 75},
-    {"Ticker": "DAX", "Quantity": 6},
-    {"Ticker": "PLTR", "Quantity": 100},
-    {"Ticker": "UQ2B.DU", "Quantity": 5},
-    {"Ticker": "DB", "Quantity": 1},
-    {"Ticker": "GS", "Quantity": 9},
-    {"Ticker": "MBG.DE", "Quantity": 50},
-]
+from datetime import datetime
+from portfolio_utils import local_tz, portfolio_tickers, portfolio_quantities, fetch_current_prices
 
 cash_position = 17000  # Cash position in USD
 
 
-def fetch_current_prices(tickers):
-    """Fetch current prices for a list of tickers."""
-    prices = {}
-    for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period='1d')
-            if not data.empty and 'Close' in data.columns:
-                current_price = data['Close'].iloc[-1]
-                prices[ticker] = current_price
-            else:
-                prices[ticker] = None
-        except Exception as e:
-            prices[ticker] = None
-    return prices
-
-
-def calculate_portfolio_value(portfolio, prices, cash):
-    """Calculate total portfolio value."""
-    total_value = cash
-    portfolio_data = []
-    for asset in portfolio:
-        ticker = asset["Ticker"]
-        quantity = asset["Quantity"]
-        price = prices.get(ticker)
-        if price is not None:
-            value = price * quantity
-            total_value += value
-            portfolio_data.append({"Ticker": ticker, "Quantity": quantity, "Price": price, "Value": value})
-        else:
-            portfolio_data.append({"Ticker": ticker, "Quantity": quantity, "Price": "N/A", "Value": "N/A"})
+def calculate_portfolio_value(tickers, quantities, prices, cash):
+    """Calculate total portfolio value and the overview table."""
+    price_array = np.array([prices.get(ticker) for ticker in tickers], dtype=np.float64)  # Missing prices become NaN
+    has_price = ~np.isnan(price_array)
+    values = price_array * quantities
+    total_value = cash + values[has_price].sum()
+    portfolio_data = pd.DataFrame({
+        "Ticker": tickers,
+        "Quantity": quantities,
+        "Price": pd.Series(price_array, dtype=object).where(has_price, "N/A"),
+        "Value": pd.Series(values, dtype=object).where(has_price, "N/A"),
+    })
     return total_value, portfolio_data
 
 
@@ -66,17 +28,15 @@ def main():
     st.title("Investment Portfolio Performance")
 
     # Fetch prices
-    tickers = [asset["Ticker"] for asset in portfolio]
     st.write("Fetching current prices...")
-    prices = fetch_current_prices(tickers)
+    prices = fetch_current_prices(portfolio_tickers, datetime.now(local_tz))
 
     # Calculate values
-    total_value, portfolio_data = calculate_portfolio_value(portfolio, prices, cash_position)
+    total_value, portfolio_data = calculate_portfolio_value(portfolio_tickers, portfolio_quantities, prices, cash_position)
 
     # Display portfolio table
     st.subheader("Portfolio Overview")
-    df = pd.DataFrame(portfolio_data)
-    st.table(df)
+    st.table(portfolio_data)
 
     # Display total value
     st.subheader("Total Portfolio Value")
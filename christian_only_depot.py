@@ -1,31 +1,11 @@
-import yfinance as yf
 import pandas as pd
+import numpy as np
 import streamlit as st
 import json
 import os
-from datetime import datetime
-
-# Initial portfolio and ownership
-portfolio = [
-    {"Ticker": "URTH", "Quantity": 480},
-    {"Ticker": "WFC", "Quantity": 400},
-    {"Ticker": "HLBZF", "Quantity": 185},
-    {"Ticker": "C", "Quantity": 340},
-    {"Ticker": "BPAQF", "Quantity": 2000},
-    {"Ticker": "POAHF", "Quantity": 150},
-    {"Ticker": "EXV1.DE", "Quantity": 284},
-    {"Ticker": "1COV.DE", "Quantity": 100},
-    {"Ticker": "SPY", "Quantity": 10},
-    {"Ticker": "HYMTF", "Quantity": 100},
-    {"Ticker": "SHEL", "Quantity": 75},
-    {"Ticker": "DAX", "Quantity": 6},
-    {"Ticker": "PLTR", "Quantity": 100},
-    {"Ticker": "UQ2B.DU", "Quantity": 5},
-    {"Ticker": "DB", "Quantity": 1},
-    {"Ticker": "GS", "Quantity": 9},
-    {"Ticker": "MBG.DE", "Quantity": 50},
-]
+from portfolio_utils import portfolio_tickers, portfolio_quantities, fetch_historical_prices, read_data_file, write_json_atomic
 
+# Initial cash and ownership
 initial_cash_position = 27000
 data_file = "christian_data.json"
 
@@ -33,9 +13,8 @@ data_file = "christian_data.json"
 def load_data():
     if os.path.exists(data_file):
         try:
-            with open(data_file, "r") as f:
-                data = json.load(f)
-                return data.get("christian", {"Percentage": 0.15000000}), data.get("transactions", [])
+            data = read_data_file(data_file, os.path.getmtime(data_file))
+            return data.get("christian", {"Percentage": 0.15000000}), data.get("transactions", [])
         except json.JSONDecodeError:
             st.warning("Data file is corrupt. Reinitializing.")
             return {"Percentage": 0.15000000}, []
@@ -46,76 +25,43 @@ def load_data():
 
 
 def save_data(christian, transactions):
-    with open(data_file, "w") as f:
-        json.dump({"christian": christian, "transactions": transactions}, f)
+    write_json_atomic(data_file, {"christian": christian, "transactions": transactions})
 
 
-# Fetch historical prices
-def fetch_historical_prices(tickers):
-    historical_prices = {}
-    for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period="2y", interval="1mo")
-            if not data.empty:
-                historical_prices[ticker] = data["Close"].fillna(method="ffill")
-            else:
-                historical_prices[ticker] = None
-        except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
-            historical_prices[ticker] = None
-    return historical_prices
-
-
-def calculate_current_value(portfolio, christian, initial_cash, historical_prices):
-    total_value = initial_cash
-    for asset in portfolio:
-        ticker = asset["Ticker"]
-        quantity = asset["Quantity"]
-        prices = historical_prices.get(ticker)
-        if prices is not None and not prices.empty:
-            current_price = prices.iloc[-1]
-            if pd.notna(current_price) and current_price > 0:
-                total_value += current_price * quantity
-    christian_value = total_value * (christian["Percentage"] / 100)
-    return christian_value
-
-
-def calculate_monthly_christian_share(portfolio, historical_prices, christian, initial_cash):
-    all_dates = set()
-    for prices in historical_prices.values():
-        if prices is not None:
-            all_dates.update(prices.index)
-    all_dates = sorted(all_dates)
-
-    monthly_values = []
-    for date in all_dates:
-        total_value = initial_cash
-        for asset in portfolio:
-            ticker = asset["Ticker"]
-            quantity = asset["Quantity"]
-            prices = historical_prices.get(ticker)
-            if prices is not None and date in prices:
-                price = prices.loc[date]
-                if pd.isna(price) or price <= 0:
-                    continue
-                total_value += price * quantity
-        christian_value = total_value * (christian["Percentage"] / 100)
-        if christian_value >= 30000:  # Filter out values below 30k
-            monthly_values.append({"Date": date, "Christians Share": christian_value})
-
-    return pd.DataFrame(monthly_values)
+def calculate_monthly_christian_share(tickers, quantities, historical_prices, christian_fraction, initial_cash):
+    # Returns the monthly shares above the threshold and the current share. The current
+    # share is the last row: after the forward fill it holds every ticker's latest close.
+    available_prices = {ticker: prices for ticker, prices in historical_prices.items() if prices is not None}
+    if not available_prices:
+        return pd.DataFrame(columns=["Date", "Christians Share"]), initial_cash * christian_fraction
+
+    # Align all tickers on one date index, carrying the last known price forward
+    aligned = pd.concat(available_prices, axis=1, sort=True).ffill()
+    quantities = pd.Series(quantities, index=tickers).reindex(aligned.columns, fill_value=0).to_numpy(dtype=np.float64)
+
+    # Every month's total in one matrix-vector product; missing or invalid prices don't count
+    price_matrix = aligned.to_numpy(dtype=np.float64)
+    price_matrix = np.where(price_matrix > 0, price_matrix, 0.0)
+    total_values = price_matrix @ quantities + initial_cash
+    christian_values = total_values * christian_fraction
+    above_threshold = christian_values >= 30000  # Filter out values below 30k
+
+    monthly_df = pd.DataFrame({"Date": aligned.index[above_threshold], "Christians Share": christian_values[above_threshold]})
+    return monthly_df, christian_values[-1]
 
 
 def main():
     christian, transactions = load_data()
+    christian_fraction = christian["Percentage"] / 100 # Stored as a percentage
 
     st.title("Christian's Stocks")
 
-    tickers = [asset["Ticker"] for asset in portfolio]
-    historical_prices = fetch_historical_prices(tickers)
+    historical_prices = fetch_historical_prices(portfolio_tickers)
 
-    current_value = calculate_current_value(portfolio, christian, initial_cash_position, historical_prices)
+    # Monthly shares and the current share come from the same price matrix
+    monthly_christian_share, current_value = calculate_monthly_christian_share(
+        portfolio_tickers, portfolio_quantities, historical_prices, christian_fraction, initial_cash_position
+    )
     st.metric(
         label="Current Value of Christian's Share",
         value=f"€{current_value:,.2f}",
@@ -123,25 +69,16 @@ def main():
         delta_color="normal"
     )
 
-    # Calculate monthly Christian's share
-    monthly_christian_share = calculate_monthly_christian_share(
-        portfolio, historical_prices, christian, initial_cash_position
-    )
-
-    # Add current value as a datapoint
-    current_date = pd.Timestamp.now()
-    if monthly_christian_share.empty:
-        monthly_christian_share = pd.DataFrame([{"Date": current_date, "Christians Share": current_value}])
-    else:
-        monthly_christian_share = pd.concat(
-            [monthly_christian_share, pd.DataFrame([{"Date": current_date, "Christians Share": current_value}])],
-            ignore_index=True
-        )
+    # Add current value as a datapoint; plain lists let it be appended without copying the frame
+    chart_dates = monthly_christian_share["Date"].tolist()
+    chart_values = monthly_christian_share["Christians Share"].tolist()
+    chart_dates.append(pd.Timestamp.now())
+    chart_values.append(current_value)
 
     # Display Christian's share chart
     st.subheader("Christian's Share Over the Last 2 Years")
-    if not monthly_christian_share.empty:
-        st.line_chart(monthly_christian_share.set_index("Date")["Christians Share"])
+    if chart_dates:
+        st.line_chart(pd.Series(chart_values, index=pd.DatetimeIndex(chart_dates, name="Date"), name="Christians Share"))
     else:
         st.write("No data available above the threshold of €30,000.")
 
@@ -0,0 +1,248 @@
+# Shared implementation of the depot share apps (annika_only_depot.py,
+# parents_depot_only.py, juergen.py). Each app only supplies its portfolio,
+# cash and ownership settings and calls run_app().
+import pandas as pd
+import numpy as np
+import streamlit as st
+from datetime import datetime
+import os
+import json
+from portfolio_utils import local_tz, read_data_file, fetch_historical_prices, fetch_daily_prices
+
+# yfinance uses ^GDAXI for DAX index
+yahoo_symbols = {"DAX": "^GDAXI"}
+
+
+def load_ownership_fraction(data_file_path, default_percentage):
+    # The file stores the ownership as a percentage; callers get it as a fraction
+    try:
+        # One stat both checks for the file and yields the cache key
+        mtime = os.stat(data_file_path).st_mtime
+    except FileNotFoundError:
+        return default_percentage / 100
+    try:
+        data = read_data_file(data_file_path, mtime)
+        return data.get("ownership", {"Percentage": default_percentage})["Percentage"] / 100
+    except json.JSONDecodeError:
+        st.warning("Data file is corrupt. Using default values.")
+        return default_percentage / 100
+
+
+def calculate_monthly_share_value(tickers, quantities, historical_prices, ownership_fraction, initial_cash_val, threshold):
+    # Only assets with a price history take part
+    has_history = np.array([historical_prices.get(ticker) is not None for ticker in tickers], dtype=bool)
+    if not has_history.any(): # Handle case where no historical prices were fetched
+        return pd.DataFrame(columns=["Date", "Share Value"])
+
+    # One dates x tickers matrix, carrying the last known price forward on the union of dates
+    price_df = pd.concat({ticker: historical_prices[ticker] for ticker, ok in zip(tickers, has_history) if ok}, axis=1, sort=True).ffill()
+    price_matrix = price_df.to_numpy(dtype=np.float64)
+    price_matrix = np.where(price_matrix > 0, price_matrix, 0.0) # Missing or invalid prices don't count
+
+    total_values = price_matrix @ quantities[has_history] + initial_cash_val
+    share_values = total_values * ownership_fraction
+    above_threshold = share_values >= threshold
+
+    return pd.DataFrame({"Date": price_df.index[above_threshold], "Share Value": share_values[above_threshold]})
+
+def format_column(values, fmt, valid, placeholder):
+    # Formats a numeric column for display, using placeholder where valid is False
+    return pd.Series(values).map(fmt.format).where(valid, placeholder)
+
+
+def run_app(portfolio_assets, initial_cash, default_percentage, threshold, target_value, target_label, data_file_path="parents_data.json"):
+    st.set_page_config(layout="wide")
+    st.title("📈 Depot Anteil")
+
+    # Column views of portfolio_assets for the vectorized calculations
+    asset_tickers = tuple(asset["Ticker"] for asset in portfolio_assets)
+    asset_names = [asset["Name"] for asset in portfolio_assets]
+    asset_quantities = np.array([asset["Quantity"] for asset in portfolio_assets], dtype=np.float64)
+
+    ownership_fraction = load_ownership_fraction(data_file_path, default_percentage)
+
+    current_datetime_local = datetime.now(local_tz)
+    current_date_local = current_datetime_local.date()
+
+    # Monthly history only changes once a day, so keep it in the session and skip
+    # even the cache lookup on reruns. Only a complete history is kept: with failed
+    # tickers every rerun goes back to the cache, which retries once its entry
+    # expires. Daily prices are refreshed while the markets trade.
+    historical_key = (asset_tickers, current_date_local)
+    if st.session_state.get("historical_key") == historical_key:
+        historical_prices = st.session_state["historical_prices"]
+    else:
+        # Tuples keep the arguments hashable for st.cache_data
+        historical_prices = fetch_historical_prices(asset_tickers, yahoo_symbols, local_time=True)
+    history_complete = all(prices is not None for prices in historical_prices.values())
+    if history_complete:
+        st.session_state["historical_prices"] = historical_prices
+        st.session_state["historical_key"] = historical_key
+    daily_prices = fetch_daily_prices(asset_tickers, current_datetime_local, yahoo_symbols)
+    for ticker in asset_tickers:
+        symbol = yahoo_symbols.get(ticker, ticker)
+        if historical_prices[ticker] is None:
+            st.warning(f"No historical data for {ticker} ({symbol}).")
+        if daily_prices[ticker] is None:
+            st.warning(f"No daily data for {ticker} ({symbol}).")
+
+    # Midnight today as a tz-aware Timestamp, so index comparisons stay on datetime64
+    start_of_today = pd.Timestamp(current_datetime_local).normalize()
+    
+    # Close and open prices as one frame each (tickers as columns), so today's and
+    # yesterday's prices are a single row lookup instead of one per ticker
+    current_price_series = pd.Series(dtype=np.float64)
+    yesterday_open_series = pd.Series(dtype=np.float64)
+    available_daily = {ticker: data for ticker, data in daily_prices.items() if data is not None and not data.empty}
+    if available_daily:
+        close_df = pd.concat({ticker: data["Close"] for ticker, data in available_daily.items()}, axis=1, sort=True).ffill()
+        open_df = pd.concat({ticker: data["Open"] for ticker, data in available_daily.items()}, axis=1, sort=True).ffill()
+        current_price_series = close_df.iloc[-1]
+        # The index is sorted, so the last row before today sits right before today's insertion point
+        before_today = open_df.index.searchsorted(start_of_today, side="left")
+        if before_today > 0:
+            yesterday_open_series = open_df.iloc[before_today - 1]
+
+    # Price vectors aligned with portfolio_assets, missing prices as NaN
+    current_prices = current_price_series.reindex(asset_tickers).to_numpy(dtype=np.float64)
+    yesterday_open_prices = yesterday_open_series.reindex(asset_tickers).to_numpy(dtype=np.float64)
+
+    # The day-over-day change only counts assets priced on both days, so a missing opening
+    # price neither hides the change nor books a whole position as today's gain
+    comparable = (current_prices > 0) & (yesterday_open_prices > 0)
+
+    # Today's value, and today's and yesterday's value of the comparable assets, in a single matrix-vector product
+    price_matrix = np.stack([
+        current_prices,
+        np.where(comparable, current_prices, 0.0),
+        np.where(comparable, yesterday_open_prices, 0.0),
+    ])
+    price_matrix = np.where(price_matrix > 0, price_matrix, 0.0) # Missing or invalid prices don't count
+    total_gross_portfolio_value, comparable_gross_value, yesterday_gross_value = price_matrix @ asset_quantities + initial_cash
+    current_value = total_gross_portfolio_value * ownership_fraction
+
+    col1, col2 = st.columns(2)
+    with col1:
+        delta_vs_target = 0
+        if current_value > 0:
+            delta_vs_target = ((current_value / target_value) - 1) * 100 if target_value != 0 else 0
+        st.metric(
+            label="Aktueller Wert (Anteil)",
+            value=f"€{current_value:,.2f}",
+            delta=f"{delta_vs_target:.2f}% vs {target_label}",
+            delta_color="normal"
+        )
+    
+    with col2:
+        yesterday_value = None
+        if comparable.any():
+            yesterday_value = yesterday_gross_value * ownership_fraction
+        
+        if yesterday_value is not None and yesterday_value != 0:
+            delta_value_abs = comparable_gross_value * ownership_fraction - yesterday_value
+            delta_percent = (delta_value_abs / yesterday_value) * 100
+            st.metric(
+                label="Veränderung seit Gestern (Open)",
+                value=f"€{delta_value_abs:+,.2f}",
+                delta=f"{delta_percent:+.2f}%",
+                delta_color="normal" if delta_percent == 0 else ("inverse" if delta_percent < 0 else "normal")
+            )
+        else:
+            st.metric("Veränderung seit Gestern (Open)", "N/A", help="Möglicherweise fehlen gestrige Eröffnungskurse oder aktuelle Werte.")
+
+    st.subheader("Wertentwicklung (Anteil) über die letzten 2 Jahre:")
+    # The monthly series only changes with the day's history or the ownership settings,
+    # so reruns from unrelated widgets reuse it. An incomplete history can still change
+    # from one rerun to the next, so it is recomputed every time.
+    monthly_key = (historical_key, asset_quantities.tobytes(), ownership_fraction, initial_cash, threshold) if history_complete else None
+    if monthly_key is None or st.session_state.get("monthly_share_key") != monthly_key:
+        st.session_state["monthly_share_value_df"] = calculate_monthly_share_value(
+            asset_tickers, asset_quantities, historical_prices, ownership_fraction, initial_cash, threshold
+        )
+        st.session_state["monthly_share_key"] = monthly_key
+    monthly_share_value_df = st.session_state["monthly_share_value_df"]
+
+    if not monthly_share_value_df.empty:
+        # The dates come straight from the history index, which fetch_historical_prices
+        # already converted to local time, so they need no parsing or localizing here
+        current_ts_for_chart = pd.Timestamp(current_datetime_local) # Reuse this run's clock reading
+        # Plain lists let the current value be appended without copying the frame
+        chart_dates = monthly_share_value_df["Date"].tolist()
+        chart_values = monthly_share_value_df["Share Value"].tolist()
+
+        # The dates are sorted, so only the last one can fall on today
+        if current_ts_for_chart.normalize() > chart_dates[-1].normalize():
+            chart_dates.append(current_ts_for_chart)
+            chart_values.append(current_value)
+
+        # The history is date-sorted and the current value is only appended after it, so no sort is needed
+        chart_series = pd.Series(chart_values, index=pd.DatetimeIndex(chart_dates, name="Date"), name="Share Value")
+        st.line_chart(
+            chart_series,
+            use_container_width=True
+        )
+    else:
+        threshold_label = f"€{threshold:,.0f}".replace(",", ".") # German thousands separator
+        st.write(f"Keine historischen Daten über dem Schwellenwert von {threshold_label} für den Chart verfügbar oder Fehler beim Laden.")
+
+    # Daily changes for all assets in one vectorized pass
+    values = current_prices * asset_quantities
+    has_change = ~np.isnan(current_prices) & (yesterday_open_prices > 0) # Ensure yesterday_open_price is positive
+    delta_prices = current_prices - yesterday_open_prices
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta_percents = delta_prices / yesterday_open_prices * 100
+    total_gains = delta_prices * asset_quantities
+
+    max_percentage_gain = {"name": None, "value": -float('inf')}
+    max_total_gain = {"name": None, "value": -float('inf')}
+    if has_change.any():
+        best = np.argmax(np.where(has_change, delta_percents, -np.inf))
+        max_percentage_gain = {"name": asset_names[best], "value": delta_percents[best]}
+        best = np.argmax(np.where(has_change, total_gains, -np.inf))
+        max_total_gain = {"name": asset_names[best], "value": total_gains[best]}
+
+    # Positions table built column by column; invalid entries keep their placeholder text
+    has_price = ~np.isnan(current_prices)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_anteil = values / total_gross_portfolio_value * 100
+    debug_data = pd.DataFrame({
+        "Ticker": asset_tickers,
+        "Name": asset_names,
+        "Menge": asset_quantities,
+        "Preis": format_column(current_prices, "€{:.2f}", has_price, "Fehlend"),
+        "Wert": format_column(values, "€{:,.2f}", has_price, "Fehlend"),
+        "% Anteil": format_column(percent_anteil, "{:.2f}%", has_price & (total_gross_portfolio_value != 0), "N/A"),
+        "Tagesänderung (€)": format_column(delta_prices, "€{:+.2f}", has_change, "N/A"),
+        "Tagesänderung (%)": format_column(delta_percents, "{:+.2f}%", has_change, "N/A"),
+        "Gesamtgewinn Heute": format_column(total_gains, "€{:+,.2f}", has_change, "N/A"),
+    })
+
+    st.subheader("🏅 Tagesperformance Highlights")
+    valid_percentage_gain = max_percentage_gain["name"] is not None and max_percentage_gain["value"] != -float('inf')
+    valid_total_gain = max_total_gain["name"] is not None and max_total_gain["value"] != -float('inf')
+
+    if valid_percentage_gain and valid_total_gain:
+        st.success(
+            f"🏆 **Beste Performance Heute:** {max_percentage_gain['name']} "
+            f"({max_percentage_gain['value']:+.2f}%)\n\n"
+            f"💰 **Höchster Gewinn Heute:** {max_total_gain['name']} "
+            f"(€{max_total_gain['value']:+,.2f})"
+        )
+    elif valid_percentage_gain:
+         st.info(f"🏆 **Beste Performance Heute:** {max_percentage_gain['name']} ({max_percentage_gain['value']:+.2f}%)")
+    elif valid_total_gain:
+         st.info(f"💰 **Höchster Gewinn Heute:** {max_total_gain['name']} (€{max_total_gain['value']:+,.2f})")
+    else:
+        st.warning("⚠️ Keine vollständigen Tagesdaten für Performance Highlights verfügbar.")
+
+    st.subheader("Detaillierte Positionen")
+    st.dataframe(
+        debug_data,
+        height=600,
+        use_container_width=True,
+        column_config={
+            "Menge": st.column_config.NumberColumn(format="%d"),
+            # Add other column configs if needed
+        }
+    )
+
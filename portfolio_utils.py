@@ -0,0 +1,219 @@
+# Portfolio and price fetchers shared by depot_app.py, christian_only_depot.py,
+# streamlit_app.py and Annika1.py. Defining the fetchers once also lets the apps
+# share their st.cache_data entries when they run in the same server.
+import pandas as pd
+import numpy as np
+import streamlit as st
+from datetime import datetime
+import pytz
+import hashlib
+import time
+import os
+import json
+import threading
+
+local_tz = pytz.timezone("Europe/Berlin")
+cache_dir = "cache"
+cache_max_age_days = 7
+
+portfolio = [
+    {"Ticker": "URTH", "Quantity": 480},
+    {"Ticker": "WFC", "Quantity": 400},
+    {"Ticker": "HLBZF", "Quantity": 185},
+    {"Ticker": "C", "Quantity": 340},
+    {"Ticker": "BPAQF", "Quantity": 2000},
+    {"Ticker": "POAHF", "Quantity": 150},
+    {"Ticker": "EXV1.DE", "Quantity": 284},
+    {"Ticker": "1COV.DE", "Quantity": 100},
+    {"Ticker": "SPY", "Quantity": 10},
+    {"Ticker": "HYMTF", "Quantity": 100},
+    {"Ticker": "SHEL", "Quantity": 75},
+    {"Ticker": "DAX", "Quantity": 6},
+    {"Ticker": "PLTR", "Quantity": 100},
+    {"Ticker": "UQ2B.DU", "Quantity": 5},
+    {"Ticker": "DB", "Quantity": 1},
+    {"Ticker": "GS", "Quantity": 9},
+    {"Ticker": "MBG.DE", "Quantity": 50},
+]
+
+# Column views of portfolio for the vectorized calculations. Quantities keep
+# their inferred dtype so whole shares still display as integers.
+portfolio_tickers = tuple(asset["Ticker"] for asset in portfolio)
+portfolio_quantities = np.array([asset["Quantity"] for asset in portfolio])
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def read_data_file(path, mtime):
+    # mtime is only part of the cache key, so saving the file invalidates the entry.
+    # Callers get the shared parsed object and must copy it before editing it.
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_json_atomic(path, data):
+    # Write to a temporary file first so a crash mid-write can't leave a truncated data file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def cleanup_price_cache():
+    # Drop cached downloads older than a week
+    cutoff = time.time() - cache_max_age_days * 86400
+    try:
+        entries = list(os.scandir(cache_dir))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.name.endswith(".parquet") and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def download_with_disk_cache(actual_tickers, period, interval):
+    # Monthly bars change at most once a day, so a parquet copy per day survives
+    # server restarts and saves the Yahoo round-trip on a cold start.
+    # Returns the raw yf.download frame (tickers on the first column level).
+    key = hashlib.sha1("|".join([*actual_tickers, period, interval]).encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{key}_{datetime.now(local_tz).date().isoformat()}.parquet")
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            print(f"Error reading price cache {cache_path}: {e}")
+    import yfinance as yf # Imported on a cache miss only; it is the slowest import here
+    data = yf.download(actual_tickers, period=period, interval=interval, group_by="ticker", threads=True, progress=False)
+    # Failed tickers come back as all-NaN columns. Only complete downloads go to disk,
+    # otherwise a failure would be served for the rest of the day.
+    downloaded = data.columns.get_level_values(0) if not data.empty else []
+    complete = all(ticker in downloaded and data[ticker]["Close"].notna().any() for ticker in actual_tickers)
+    if complete:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write under a per-thread temporary name and move it into place, so concurrent
+            # sessions missing the cache can't leave or read a half-written file
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            data.to_parquet(tmp_path)
+            os.replace(tmp_path, cache_path)
+            cleanup_price_cache()
+        except Exception as e:
+            print(f"Error writing price cache {cache_path}: {e}")
+    return data
+
+
+# Fetch historical prices
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_historical_prices(tickers, symbols=None, local_time=False):
+    # Monthly closes of the last 2 years per ticker, None where the download failed.
+    # symbols maps tickers to the Yahoo symbol they are listed under; local_time
+    # converts the dates to local_tz.
+    symbols = symbols or {}
+    historical_prices = {}
+    actual_tickers = [symbols.get(ticker, ticker) for ticker in tickers]
+    try:
+        # One batched request for all tickers instead of one round-trip per ticker
+        data = download_with_disk_cache(actual_tickers, "2y", "1mo")
+    except Exception as e:
+        print(f"Error fetching historical data: {e}")
+        data = pd.DataFrame()
+    if local_time and not data.empty:
+        # Localize the shared index once so the chart dates arrive in local time
+        if data.index.tz is None:
+            data.index = data.index.tz_localize('UTC')
+        data.index = data.index.tz_convert(local_tz)
+    for ticker, actual_ticker in zip(tickers, actual_tickers):
+        # Failed tickers come back as all-NaN columns
+        if actual_ticker in data.columns.get_level_values(0):
+            closes = data[actual_ticker]["Close"].ffill().dropna()
+            historical_prices[ticker] = closes if not closes.empty else None # Keep original ticker key
+        else:
+            historical_prices[ticker] = None
+    return historical_prices
+
+
+class IncompleteDownload(Exception):
+    # Raised out of the long-lived price cache so a partial download isn't kept there
+    def __init__(self, prices):
+        super().__init__("Some tickers failed to download")
+        self.prices = prices
+
+
+def five_minute_slot(now):
+    return now.strftime("%Y-%m-%d %H:") + f"{now.minute - now.minute % 5:02d}"
+
+
+def price_refresh_key(now):
+    # Cache key for current prices. Xetra and NYSE trade between 09:00 and 22:00 Berlin
+    # time on weekdays: then the key changes every 5 minutes, otherwise only when the
+    # markets open or close, so nothing is re-downloaded while prices can't move
+    if now.weekday() < 5 and 9 <= now.hour < 22:
+        return five_minute_slot(now)
+    return now.strftime("%Y-%m-%d") + (" after close" if now.hour >= 22 else " before open")
+
+
+@st.cache_data(ttl=300, max_entries=16, show_spinner=False)
+def download_daily_prices(tickers, symbols, slot):
+    # Daily bars of the last 10 days per ticker with the dates in local time, None where
+    # the download failed. slot is the current 5-minute slot, so failed tickers are
+    # retried at most every 5 minutes.
+    symbols = symbols or {}
+    daily_prices = {}
+    actual_tickers = [symbols.get(ticker, ticker) for ticker in tickers]
+    # Fetch slightly more data to ensure previous day is available
+    import yfinance as yf # Imported on a cache miss only
+    data = yf.download(actual_tickers, period="10d", interval="1d", group_by="ticker", threads=True, progress=False)
+    if not data.empty:
+        # yfinance can repeat column names; drop the repeats once so every
+        # ticker's "Close" and "Open" below are plain Series
+        data = data.loc[:, ~data.columns.duplicated()]
+        # Sort (yfinance normally returns it sorted already) and localize the shared index once
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        if data.index.tz is None:
+            data.index = data.index.tz_localize('UTC')
+        data.index = data.index.tz_convert(local_tz)
+    for ticker, actual_ticker in zip(tickers, actual_tickers):
+        if actual_ticker in data.columns.get_level_values(0):
+            # Drop the rows where only other tickers traded
+            ticker_data = data[actual_ticker].dropna(how="all")
+        else:
+            ticker_data = pd.DataFrame()
+        daily_prices[ticker] = ticker_data if not ticker_data.empty else None # Keep original ticker key
+    if all(prices is None for prices in daily_prices.values()):
+        # st.cache_data doesn't cache exceptions, so the next rerun tries again
+        raise RuntimeError("No daily data for any ticker")
+    return daily_prices
+
+
+@st.cache_data(ttl=6 * 3600, max_entries=16, show_spinner=False)
+def fetch_complete_daily_prices(tickers, refresh_key, symbols):
+    # Only complete downloads are cached until refresh_key changes
+    daily_prices = download_daily_prices(tickers, symbols, five_minute_slot(datetime.now(local_tz)))
+    if any(prices is None for prices in daily_prices.values()):
+        raise IncompleteDownload(daily_prices)
+    return daily_prices
+
+
+def fetch_daily_prices(tickers, now, symbols=None):
+    # Daily bars per ticker (see download_daily_prices), None where the download failed.
+    # Complete downloads are kept until price_refresh_key(now) changes, while failed
+    # tickers are retried every 5 minutes instead of staying missing for hours.
+    try:
+        return fetch_complete_daily_prices(tickers, price_refresh_key(now), symbols)
+    except IncompleteDownload as e:
+        return e.prices
+    except Exception as e:
+        print(f"Error fetching daily data: {e}")
+        return {ticker: None for ticker in tickers}
+
+
+def fetch_current_prices(tickers, now):
+    """Latest close per ticker from the daily prices, None where none is available."""
+    prices = {}
+    for ticker, data in fetch_daily_prices(tickers, now).items():
+        closes = data["Close"].dropna() if data is not None else pd.Series(dtype=float)
+        prices[ticker] = float(closes.iloc[-1]) if not closes.empty else None
+    return prices
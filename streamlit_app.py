@@ -1,39 +1,21 @@
-import yfinance as yf
 import pandas as pd
+import numpy as np
 import streamlit as st
-import json
 import os
+import copy
+from datetime import datetime
+from portfolio_utils import local_tz, portfolio_tickers, portfolio_quantities, fetch_current_prices, read_data_file, write_json_atomic
 
-# Initial portfolio and ownership
-portfolio = [
-    {"Ticker": "URTH", "Quantity": 480},
-    {"Ticker": "WFC", "Quantity": 400},
-    {"Ticker": "HLBZF", "Quantity": 185},
-    {"Ticker": "C", "Quantity": 340},
-    {"Ticker": "BPAQF", "Quantity": 2000},
-    {"Ticker": "POAHF", "Quantity": 150},
-    {"Ticker": "EXV1.DE", "Quantity": 284},
-    {"Ticker": "1COV.DE", "Quantity": 100},
-    {"Ticker": "SPY", "Quantity": 10},
-    {"Ticker": "HYMTF", "Quantity": 100},
-    {"Ticker": "SHEL", "Quantity": 75},
-    {"Ticker": "DAX", "Quantity": 6},
-    {"Ticker": "PLTR", "Quantity": 100},
-    {"Ticker": "UQ2B.DU", "Quantity": 5},
-    {"Ticker": "DB", "Quantity": 1},
-    {"Ticker": "GS", "Quantity": 9},
-    {"Ticker": "MBG.DE", "Quantity": 50},
-]
-
+# Initial cash and ownership
 initial_cash_position = 17000
 data_file = "portfolio_data.json"
 
 # Load or initialize ownership and transaction log
 def load_data():
     if os.path.exists(data_file):
-        with open(data_file, "r") as f:
-            data = json.load(f)
-            return data["ownership"], data["transactions"]
+        # Transactions update these in place, so work on a copy of the cached parse
+        data = copy.deepcopy(read_data_file(data_file, os.path.getmtime(data_file)))
+        return data["ownership"], data["transactions"]
     else:
         # Default ownership
         ownership = {
@@ -46,40 +28,21 @@ def load_data():
 
 
 def save_data(ownership, transactions):
-    with open(data_file, "w") as f:
-        json.dump({"ownership": ownership, "transactions": transactions}, f)
-
-
-# Fetch current prices
-def fetch_current_prices(tickers):
-    prices = {}
-    for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period="1d")
-            if not data.empty and "Close" in data.columns:
-                prices[ticker] = data["Close"].iloc[-1]
-            else:
-                prices[ticker] = None
-        except Exception:
-            prices[ticker] = None
-    return prices
+    write_json_atomic(data_file, {"ownership": ownership, "transactions": transactions})
 
 
 # Calculate portfolio value
-def calculate_portfolio_value(portfolio, prices, cash):
-    total_value = cash
-    portfolio_data = []
-    for asset in portfolio:
-        ticker = asset["Ticker"]
-        quantity = asset["Quantity"]
-        price = prices.get(ticker)
-        if price:
-            value = price * quantity
-            total_value += value
-            portfolio_data.append({"Ticker": ticker, "Quantity": quantity, "Price": price, "Value": value})
-        else:
-            portfolio_data.append({"Ticker": ticker, "Quantity": quantity, "Price": "N/A", "Value": "N/A"})
+def calculate_portfolio_value(tickers, quantities, prices, cash):
+    price_array = np.array([prices.get(ticker) for ticker in tickers], dtype=np.float64)  # Missing prices become NaN
+    has_price = ~np.isnan(price_array)
+    values = price_array * quantities
+    total_value = cash + values[has_price].sum()
+    portfolio_data = pd.DataFrame({
+        "Ticker": tickers,
+        "Quantity": quantities,
+        "Price": pd.Series(price_array, dtype=object).where(has_price, "N/A"),
+        "Value": pd.Series(values, dtype=object).where(has_price, "N/A"),
+    })
     return total_value, portfolio_data
 
 
@@ -110,17 +73,15 @@ def main():
     st.title("Investment Portfolio Performance")
 
     # Fetch prices
-    tickers = [asset["Ticker"] for asset in portfolio]
     st.write("Fetching current prices...")
-    prices = fetch_current_prices(tickers)
+    prices = fetch_current_prices(portfolio_tickers, datetime.now(local_tz))
 
     # Calculate portfolio values
-    total_portfolio_value, portfolio_data = calculate_portfolio_value(portfolio, prices, initial_cash_position)
+    total_portfolio_value, portfolio_data = calculate_portfolio_value(portfolio_tickers, portfolio_quantities, prices, initial_cash_position)
 
     # Display portfolio table
     st.subheader("Portfolio Overview")
-    df = pd.DataFrame(portfolio_data)
-    st.table(df)
+    st.table(portfolio_data)
 
     # Display individual balances
     st.subheader("Individual Balances and Ownership")
@@ -144,7 +105,8 @@ def main():
     # Transaction log
     st.subheader("Transaction Log")
     if transactions:
-        log_df = pd.DataFrame(transactions)
+        # Fixed column list, so pandas does not have to infer the columns from every record
+        log_df = pd.DataFrame.from_records(transactions, columns=["Person", "Amount"])
         st.table(log_df)
     else:
         st.write("No transactions logged yet.")
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import yfinance as yf
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Configuration ---
 st.set_page_config(page_title="Stock Portfolio Tracker", layout="wide")
@@ -41,7 +42,27 @@ christian_fraction = christian_pct / 100.0
 parents_fraction   = parents_pct / 100.0
 
 # --- Helper Functions ---
-@st.cache_data(ttl=600)
+def fetch_ticker_price(ticker, ticker_object):
+    """
+    Fetches the current price for a single yfinance Ticker.
+    Returns a (price, message) tuple; message is a (level, text) pair when the
+    price could not be found, since Streamlit calls can't be made from worker threads.
+    """
+    try:
+        info = ticker_object.info
+        price = (info.get('currentPrice')
+                 or info.get('regularMarketPrice')
+                 or info.get('previousClose'))
+        if price:
+            return price, None
+        hist = ticker_object.history(period='2d')
+        if not hist.empty:
+            return hist['Close'].iloc[-1], None
+        return None, ("warning", f"Could not find price data for {ticker}. Info: {info}")
+    except Exception as e:
+        return None, ("error", f"Error fetching data for {ticker}: {e}")
+
+@st.cache_data(ttl=600, show_spinner=False)
 def get_stock_data(tickers):
     """
     Fetches current price data for a list of tickers using yfinance.
@@ -50,24 +71,17 @@ def get_stock_data(tickers):
     """
     data = {}
     ticker_objects = yf.Tickers(tickers)
-    for ticker in tickers:
-        try:
-            info = ticker_objects.tickers[ticker].info
-            price = (info.get('currentPrice')
-                     or info.get('regularMarketPrice')
-                     or info.get('previousClose'))
-            if price:
-                data[ticker] = price
+    # The per-ticker info lookups are network-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=min(16, len(tickers)) or 1) as executor:
+        results = list(executor.map(lambda t: fetch_ticker_price(t, ticker_objects.tickers[t]), tickers))
+    for ticker, (price, message) in zip(tickers, results):
+        data[ticker] = price
+        if message is not None:
+            level, text = message
+            if level == "error":
+                st.error(text)
             else:
-                hist = ticker_objects.tickers[ticker].history(period='2d')
-                if not hist.empty:
-                    data[ticker] = hist['Close'].iloc[-1]
-                else:
-                    st.warning(f"Could not find price data for {ticker}. Info: {info}")
-                    data[ticker] = None
-        except Exception as e:
-            st.error(f"Error fetching data for {ticker}: {e}")
-            data[ticker] = None
+                st.warning(text)
     return data
 
 # --- Main Application Logic ---